@@ -123,32 +123,42 @@ def matches_tag_query(case_fun,
     :param filter:
     :return: True if the case_fun is selected by the query.
     """
-    selected = True
+    if has_tag is not None and not isinstance(has_tag, (tuple, list, set)):
+        has_tag = (has_tag,)
 
-    # query on tags
-    if has_tag is not None:
-        selected = selected and CaseInfo.get_from(case_fun).matches_tag_query(has_tag)
+    if filter is None:
+        filter = ()
+    elif not isinstance(filter, (tuple, set, list)):
+        filter = (filter,)
 
-    # filter function
-    if filter is not None:
-        if not isinstance(filter, (tuple, set, list)):
-            filter = (filter,)
+    return matches_tag_query_fast(case_fun, has_tags=has_tag, filters=filter)
 
-        for _filter in filter:
-            # break if already unselected
-            if not selected:
-                return selected
 
-            # try next filter
-            try:
-                res = _filter(case_fun)
-                # keep this in the try catch in case there is an issue with the truth value of result
-                selected = selected and res
-            except:  # noqa
-                # any error leads to a no-match
-                selected = False
+def matches_tag_query_fast(case_fun,
+                           has_tags=None,  # type: Optional[Union[Tuple, List, Set]]
+                           filters=()      # type: Iterable[Callable[[Iterable[Any]], bool]]
+                           ):
+    # type: (...) -> bool
+    """
+    Same as `matches_tag_query`, but with `has_tags` and `filters` already normalized: `has_tags` should be None or a
+    tuple, list or set of tags, and `filters` should be an iterable of filter callables. This is used when the same
+    query is applied to many case functions.
+    """
+    # query on tags
+    if has_tags is not None and not CaseInfo.get_from(case_fun).matches_tag_query(has_tags):
+        return False
 
-    return selected
+    # filter functions
+    for _filter in filters:
+        try:
+            # keep this in the try catch in case there is an issue with the truth value of result
+            if not _filter(case_fun):
+                return False
+        except:  # noqa
+            # any error leads to a no-match
+            return False
+
+    return True
 
 
 @function_decorator
@@ -212,9 +222,10 @@ def is_case_function(f, prefix=CASE_PREFIX_FUN, check_prefix=True):
     :param check_prefix:
     :return:
     """
-    if not callable(f):
-        return False
-    elif safe_isclass(f):
-        return False
-    else:
-        return f.__name__.startswith(prefix) if check_prefix else True
+    if check_prefix:
+        # check the name first: this is the cheapest way to discard most objects
+        f_name = getattr(f, '__name__', None)
+        if f_name is None or not f_name.startswith(prefix):
+            return False
+
+    return callable(f) and not safe_isclass(f)
@@ -1,6 +1,3 @@
-# Use true division operator always even in old python 2.x (used in `_get_case_getter_s`)
-from __future__ import division
-
 import sys
 from abc import abstractmethod, ABCMeta
 from decopatch import function_decorator, DECORATED, with_parenthesis
@@ -311,27 +308,30 @@ def _get_case_getter_s(has_tag=None, filter=None):
         raise ValueError("`filter` should be a callable starting in pytest-cases 0.8.0. If you wish to provide a single"
                          " tag to match, use `has_tag` instead.")
 
+    # no need to evaluate the query on each case if there is no query
+    no_query = has_tag is None and filter is None
+
     def __get_case_getter_s(f,
                             co_firstlineno=None,
-                            cases_dct=None):
+                            cases_lst=None):
         # type: (...) -> Optional[List[CaseDataFromFunction]]
         """
         Creates the case function getter or the several cases function getters (in case of a generator) associated with
-        function f. If cases_dct is provided, they are stored in this dictionary with a key equal to their code line number.
-        For generated cases, a floating line number is created to preserve order.
+        function f. If cases_lst is provided, they are appended to this list as (line number, sub-index, getter) tuples,
+        where the line number is the one of the code and the sub-index preserves the order of generated cases.
 
         :param f:
-        :param co_firstlineno: should be provided if cases_dct is provided.
-        :param cases_dct: an optional dictionary where to store the created function wrappers
+        :param co_firstlineno: should be provided if cases_lst is provided.
+        :param cases_lst: an optional list where to store the created function wrappers
         :return:
         """
         # create a return variable if needed
-        if cases_dct is None:
+        if cases_lst is None:
             cases_list = []
         else:
             cases_list = None
 
-        if matches_tag_query(f, has_tag=has_tag, filter=filter):
+        if no_query or matches_tag_query(f, has_tag=has_tag, filter=filter):
             # Handle case generators
             if is_case_generator(f):
                 already_used_names = []
@@ -379,23 +379,22 @@ def _get_case_getter_s(has_tag=None, filter=None):
                     case_getter = CaseDataFromFunction(f, gen_case_name, gen_case_params_dct)
 
                     # save the result in the list or the dict
-                    if cases_dct is None:
+                    if cases_lst is None:
                         cases_list.append(case_getter)
                     else:
-                        # with an artificial floating point line number to keep order in dict
-                        gen_line_nb = co_firstlineno + (gen_case_id / nb_cases_generated)
-                        cases_dct[gen_line_nb] = case_getter
+                        # with a sub-index to keep order
+                        cases_lst.append((co_firstlineno, gen_case_id, case_getter))
             else:
                 # single case
                 case_getter = CaseDataFromFunction(f)
 
                 # save the result
-                if cases_dct is None:
+                if cases_lst is None:
                     cases_list.append(case_getter)
                 else:
-                    cases_dct[co_firstlineno] = case_getter
+                    cases_lst.append((co_firstlineno, 0, case_getter))
 
-        if cases_dct is None:
+        if cases_lst is None:
             return cases_list
 
     return __get_case_getter_s
@@ -1,26 +1,37 @@
-# Use true division operator always even in old python 2.x (used in `_extract_cases_from_module`)
-from __future__ import division
-
+from fnmatch import translate
 from functools import partial
 from importlib import import_module
-from inspect import getmembers
+from inspect import getmro
+from operator import itemgetter
 import re
+import sys
 from warnings import warn
 
+try:  # python 3.3+
+    from inspect import signature
+except ImportError:
+    from funcsigs import signature  # noqa
+
+try:  # python 3.2+
+    from functools import lru_cache as lru
+except ImportError:
+    from functools32 import lru_cache as lru  # noqa
+
 from pytest_cases import fixture
 
 try:
-    from typing import Union, Callable, Iterable, Any, Type, List, Tuple  # noqa
+    from typing import Union, Callable, Iterable, Any, Type, List, Tuple, Dict  # noqa
 except ImportError:
     pass
 
 from .common_mini_six import string_types
 from .common_others import get_code_first_line, AUTO, AUTO2
-from .common_pytest_marks import copy_pytest_marks, make_marked_parameter_value
+from .common_pytest_marks import copy_pytest_marks, make_marked_parameter_value, get_pytest_parametrize_marks
 from .common_pytest_lazy_values import lazy_value
 from .common_pytest import safe_isclass, MiniMetafunc
 
-from .case_funcs_new import matches_tag_query, is_case_function, is_case_class, CaseInfo, CASE_PREFIX_FUN
+from .case_funcs_new import matches_tag_query_fast, is_case_function, is_case_class, CaseInfo, CASE_PREFIX_FUN, \
+    CASE_FIELD
 from .fixture_parametrize_plus import fixture_ref, _parametrize_plus
 
 THIS_MODULE = object()
@@ -106,6 +117,19 @@ def parametrize_with_cases(argnames,                # type: str
     return _apply_parametrization
 
 
+@lru(maxsize=256)
+def _compile_glob(glob_str  # type: str
+                  ):
+    """
+    Compiles a glob-like pattern into a regex Pattern matching the whole string, with the same syntax than `fnmatch`.
+    Results are cached since the same pattern is typically reused across all the tests of a module.
+
+    :param glob_str:
+    :return:
+    """
+    return re.compile(translate(glob_str))
+
+
 def create_glob_name_filter(glob_str  # type: str
                             ):
     """
@@ -114,12 +138,12 @@ def create_glob_name_filter(glob_str  # type: str
     :param case_fun:
     :return:
     """
-    name_matcher = re.compile(glob_str.replace("*", ".*"))
+    name_match = _compile_glob(glob_str).match
 
     def _glob_name_filter(case_fun):
         case_fun_id = case_fun._pytestcase.id
         assert case_fun_id is not None
-        return name_matcher.match(case_fun_id)
+        return name_match(case_fun_id)
 
     return _glob_name_filter
 
@@ -154,15 +178,6 @@ def get_all_cases(parametrization_target,  # type: Callable
     :param filter: a callable receiving the case function and returning True or a truth value in case the function
         needs to be selected.
     """
-    # Handle single elements
-    if isinstance(cases, string_types):
-        cases = (cases,)
-    else:
-        try:
-            cases = tuple(cases)
-        except TypeError:
-            cases = (cases,)
-
     # validate prefix
     if not isinstance(prefix, str):
         raise TypeError("`prefix` should be a string, found: %r" % prefix)
@@ -182,41 +197,68 @@ def get_all_cases(parametrization_target,  # type: Callable
 
         filters += (filter,)
 
+    # normalize the tag query once for all cases
+    if has_tag is not None and not isinstance(has_tag, (tuple, list, set)):
+        has_tag = (has_tag,)
+
     # parent package
     caller_module_name = getattr(parametrization_target, '__module__', None)
-    parent_pkg_name = '.'.join(caller_module_name.split('.')[:-1]) if caller_module_name is not None else None
+    parent_pkg_name = _split_module_parts(caller_module_name)[0] if caller_module_name is not None else None
 
     # start collecting all cases
-    cases_funs = []
-    for c in cases:
-        # load case or cases depending on type
-        if safe_isclass(c):
-            # class
-            new_cases = extract_cases_from_class(c, case_fun_prefix=prefix, check_name=False)  # do not check name, it was explicitly passed
-            cases_funs += new_cases
-        elif callable(c):
-            # function
-            if is_case_function(c, check_prefix=False):  # do not check prefix, it was explicitly passed
-                cases_funs.append(c)
-            else:
-                raise ValueError("Unsupported case function: %r" % c)
+    if cases is AUTO:
+        # fast path for the default: a single module to import and scan
+        cases_funs = extract_cases_from_module(import_default_cases_module(parametrization_target),
+                                               case_fun_prefix=prefix)
+    else:
+        # Handle single elements. Note: classes are never considered as iterables here, even if their metaclass is
+        if isinstance(cases, (list, tuple)):
+            cases = tuple(cases)
+        elif isinstance(cases, string_types) or safe_isclass(cases) or not hasattr(type(cases), '__iter__'):
+            cases = (cases,)
         else:
-            # module
-            if c is AUTO:
-                c = import_default_cases_module(parametrization_target)
-            elif c is AUTO2:
-                c = import_default_cases_module(parametrization_target, alt_name=True)
-            elif c is THIS_MODULE or c == '.':
-                c = caller_module_name
-            new_cases = extract_cases_from_module(c, package_name=parent_pkg_name, case_fun_prefix=prefix)
-            cases_funs += new_cases
+            cases = tuple(cases)
+
+        cases_funs = []
+        for c in cases:
+            # load case or cases depending on type
+            if safe_isclass(c):
+                # class
+                # do not check name, it was explicitly passed
+                new_cases = extract_cases_from_class(c, case_fun_prefix=prefix, check_name=False)
+                cases_funs += new_cases
+            elif callable(c):
+                # function
+                if is_case_function(c, check_prefix=False):  # do not check prefix, it was explicitly passed
+                    cases_funs.append(c)
+                else:
+                    raise ValueError("Unsupported case function: %r" % c)
+            else:
+                # module
+                if c is AUTO:
+                    c = import_default_cases_module(parametrization_target)
+                elif c is AUTO2:
+                    c = import_default_cases_module(parametrization_target, alt_name=True)
+                elif c is THIS_MODULE or c == '.':
+                    c = caller_module_name
+                new_cases = extract_cases_from_module(c, package_name=parent_pkg_name, case_fun_prefix=prefix)
+                cases_funs += new_cases
+
+    _get_info = CaseInfo.get_from
+    if has_tag is None and not filters:
+        # nothing to filter: only make sure that a case info with an id is attached on each case
+        for c in cases_funs:
+            c_info = getattr(c, CASE_FIELD, None)
+            if c_info is None or c_info.id is None:
+                _get_info(c, create=True, prefix_for_ids=prefix)
+        return cases_funs
 
     # filter last, for easier debugging (collection will be slightly less performant when a large volume of cases exist)
     return [c for c in cases_funs
             # IMPORTANT: with the trick below we create and attach a case info on each `c` in the same loop
-            if CaseInfo.get_from(c, create=True, prefix_for_ids=prefix)
+            if _get_info(c, create=True, prefix_for_ids=prefix)
             # this second member below is the only actual test performing query filtering
-            and matches_tag_query(c, has_tag=has_tag, filter=filters)]
+            and matches_tag_query_fast(c, has_tags=has_tag, filters=filters)]
 
 
 def get_parametrize_args(cases_funs,  # type: List[Callable]
@@ -235,7 +277,11 @@ def get_parametrize_args(cases_funs,  # type: List[Callable]
     :param cases_funs: a list of case functions returned typically by `get_all_cases`
     :return:
     """
-    return [c for _f in cases_funs for c in case_to_argvalues(_f)]
+    argvalues = []
+    argvalues_extend = argvalues.extend
+    for _f in cases_funs:
+        argvalues_extend(case_to_argvalues(_f))
+    return argvalues
 
 
 def case_to_argvalues(case_fun,                # type: Callable
@@ -258,35 +304,41 @@ def case_to_argvalues(case_fun,                # type: Callable
     case_id = case_info.id
     case_marks = case_info.marks
 
+    if _is_trivial_case(case_fun):
+        # fast path: single unparametrized case function without arguments, no need to create a MiniMetafunc
+        return (lazy_value(case_fun, id=case_id, marks=case_marks),)
+
     # get the list of all calls that pytest *would* have made for such a (possibly parametrized) function
-    meta = MiniMetafunc(case_fun)
+    requires_fixtures, is_parametrized, calls = _get_case_calls(case_fun)
 
-    if not meta.requires_fixtures:
-        if not meta.is_parametrized:
+    if not requires_fixtures:
+        if not is_parametrized:
             # single unparametrized case function
             return (lazy_value(case_fun, id=case_id, marks=case_marks),)
         else:
             # parametrized. create one version of the callable for each parametrized call
-            return tuple(lazy_value(partial(case_fun, **c.funcargs), id="%s-%s" % (case_id, c.id), marks=c.marks)
-                         for c in meta._calls)
+            _lazy_value, _partial = lazy_value, partial
+            id_prefix = "%s-" % case_id
+            return tuple([_lazy_value(_partial(case_fun, **c.funcargs) if c.funcargs else case_fun,
+                                      id=id_prefix + c.id, marks=c.marks)
+                          for c in calls])
     else:
         # at least a required fixture: create a fixture
-        # unwrap any partial that would have been created by us because the fixture was in a class
-        if isinstance(case_fun, partial):
-            host_cls = case_fun.host_class
+        # unwrap the bound function created by us if the case function was in a class
+        if isinstance(case_fun, _ClassBoundCase):
+            host = case_fun.host_class
             case_fun = case_fun.func
         else:
-            host_cls = None
-
-        host_module = import_module(case_fun.__module__)
+            # the host module is already imported: no need to go through importlib
+            host = sys.modules.get(case_fun.__module__) or import_module(case_fun.__module__)
 
         # create a new fixture and place it on the host (note: if already done, no need to recreate it)
-        existing_fix = getattr(host_cls or host_module, case_id, None)
+        existing_fix = getattr(host, case_id, None)
         if existing_fix is None:
-            # if meta.is_parametrized:
+            # if is_parametrized:
             #     nothing to do, the parametrization marks are already there
             new_fix = fixture(name=case_id)(case_fun)
-            setattr(host_cls or host_module, case_id, new_fix)
+            setattr(host, case_id, new_fix)
         else:
             raise NotImplementedError("We should check if this is the same or another and generate a new name in that "
                                       "case")
@@ -296,6 +348,61 @@ def case_to_argvalues(case_fun,                # type: Callable
         return make_marked_parameter_value(argvalues_tuple, marks=case_marks) if case_marks else argvalues_tuple
 
 
+def _get_case_calls(case_fun  # type: Callable
+                    ):
+    # type: (...) -> Tuple[bool, bool, Tuple[Any, ...]]
+    """
+    Returns a tuple (requires_fixtures, is_parametrized, calls) describing the calls that pytest would make for
+    `case_fun`, obtained with a `MiniMetafunc`. Results are cached since the same case function is typically used by
+    several tests.
+
+    :param case_fun:
+    :return:
+    """
+    # a new `_ClassBoundCase` is created each time a case class is collected. Its signature and marks are the ones of
+    # the underlying function, so we use this function as the cache key.
+    key = (_ClassBoundCase, case_fun.func) if isinstance(case_fun, _ClassBoundCase) else case_fun
+    try:
+        return _case_calls_cache[key]
+    except KeyError:
+        meta = MiniMetafunc(case_fun)
+        res = _case_calls_cache[key] = meta.requires_fixtures, meta.is_parametrized, tuple(meta._calls)
+        return res
+
+
+_case_calls_cache = dict()  # type: Dict[Any, Tuple[bool, bool, Tuple[Any, ...]]]
+"""The (requires_fixtures, is_parametrized, calls) of each case function, see `_get_case_calls`"""
+
+
+def _is_trivial_case(case_fun  # type: Callable
+                     ):
+    # type: (...) -> bool
+    """
+    Returns True if `case_fun` is a plain python function with no arguments and no parametrization marks. Such a
+    case can not require fixtures nor be parametrized, so `case_to_argvalues` does not need a `MiniMetafunc` for it.
+    The result is cached on the function object when possible.
+
+    :param case_fun:
+    :return:
+    """
+    trivial = getattr(case_fun, '_pc_trivial', None)
+    if trivial is None:
+        code = getattr(case_fun, '__code__', None)
+        trivial = (code is not None
+                   and code.co_argcount == 0
+                   and getattr(code, 'co_kwonlyargcount', 0) == 0
+                   # the signature of a wrapper may not be the one of the wrapped function
+                   and not hasattr(case_fun, '__wrapped__')
+                   and len(get_pytest_parametrize_marks(case_fun)) == 0)
+        try:
+            case_fun._pc_trivial = trivial
+        except AttributeError:
+            # object does not accept attributes (e.g. a bound method)
+            pass
+
+    return trivial
+
+
 def import_default_cases_module(f, alt_name=False):
     """
     Implements the `module=AUTO` behaviour of `@parameterize_cases`: based on the decorated test function `f`,
@@ -309,21 +416,55 @@ def import_default_cases_module(f, alt_name=False):
     :param alt_name: a boolean (default False) to use the alternate naming scheme.
     :return:
     """
+    cases_module_name = _get_cases_module_name(f.__module__, alt_name)
+
+    # note: the module is not cached here since `sys.modules` may change (reload, in-process pytest runs...)
+    cases_module = sys.modules.get(cases_module_name)
+    if cases_module is None:
+        try:
+            cases_module = import_module(cases_module_name)
+        except ImportError:
+            raise ValueError("Error importing test cases module to parametrize function %r: unable to import AUTO%s "
+                             "cases module %r. Maybe you wish to import cases from somewhere else ? In that case "
+                             "please specify `cases=...`."
+                             % (f, '2' if alt_name else '', cases_module_name))
+    return cases_module
+
+
+@lru(maxsize=None)
+def _get_cases_module_name(module_name,  # type: str
+                           alt_name      # type: bool
+                           ):
+    # type: (...) -> str
+    """
+    Returns the name of the default cases module associated with test module `module_name`. Results are cached as
+    this is called with the same module names for all tests in a module.
+
+    :param module_name: the name of the test module
+    :param alt_name: a boolean to use the alternate naming scheme.
+    :return:
+    """
     if alt_name:
-        parts = f.__module__.split('.')
-        assert parts[-1][0:5] == 'test_'
-        cases_module_name = "%s.cases_%s" % ('.'.join(parts[:-1]), parts[-1][5:])
+        parent_pkg_name, short_name = _split_module_parts(module_name)
+        assert short_name[0:5] == 'test_'
+        return "%s.cases_%s" % (parent_pkg_name, short_name[5:])
     else:
-        cases_module_name = "%s_cases" % f.__module__
+        return "%s_cases" % module_name
 
-    try:
-        cases_module = import_module(cases_module_name)
-    except ImportError:
-        raise ValueError("Error importing test cases module to parametrize function %r: unable to import AUTO%s "
-                         "cases module %r. Maybe you wish to import cases from somewhere else ? In that case please "
-                         "specify `cases=...`."
-                         % (f, '2' if alt_name else '', cases_module_name))
-    return cases_module
+
+@lru(maxsize=1024)
+def _split_module_parts(module_name  # type: str
+                        ):
+    # type: (...) -> Tuple[str, str]
+    """
+    Splits a module name into its parent package name and its last part. For example 'a.b.c' leads to ('a.b', 'c').
+    Results are cached as this is called with the same module names for all tests in a module.
+
+    :param module_name:
+    :return:
+    """
+    parts = module_name.split('.')
+    return '.'.join(parts[:-1]), parts[-1]
 
 
 def hasinit(obj):
@@ -409,8 +550,55 @@ def extract_cases_from_module(module,                           # type: ModuleRe
     if isinstance(module, string_types):
         module = import_module(module, package=package_name)
 
-    return _extract_cases_from_module_or_class(module=module, _case_param_factory=_case_param_factory,
-                                               case_fun_prefix=case_fun_prefix)
+    if _case_param_factory is not None:
+        # legacy usage: cases generators are expanded by the factory, do not use the cache
+        return _extract_cases_from_module_or_class(module=module, _case_param_factory=_case_param_factory,
+                                                   case_fun_prefix=case_fun_prefix)
+
+    # A module that is not fully imported yet (typically the caller module, when THIS_MODULE is used) gets new members
+    # as its code is executed. We use the number of members to detect this and refresh the cache entry.
+    key = (module, case_fun_prefix)
+    nb_members = len(vars(module))
+    try:
+        cached_nb_members, cases = _extracted_cases_cache[key]
+    except KeyError:
+        cached_nb_members = None
+
+    if cached_nb_members != nb_members:
+        cases = tuple(_extract_cases_from_module_or_class(module=module, case_fun_prefix=case_fun_prefix))
+        _extracted_cases_cache[key] = nb_members, cases
+
+    # return a new list so that the cache can not be modified by the caller
+    return list(cases)
+
+
+_extracted_cases_cache = dict()  # type: Dict[Tuple[ModuleType, str], Tuple[int, Tuple[Callable, ...]]]
+"""Cases found by `extract_cases_from_module` for each (module, case function prefix), with the nb of module members"""
+
+
+def _class_members(cls  # type: Type
+                   ):
+    # type: (...) -> List[Tuple[str, Any]]
+    """
+    Returns a list of (name, member) tuples for all members defined in `cls` or its base classes (except `object`),
+    in no particular order. Members are taken directly from the classes `__dict__`, so functions are not bound. Dunder
+    members, static methods and class methods are skipped.
+
+    :param cls:
+    :return:
+    """
+    members = []
+    seen = set()
+    for base in getmro(cls):
+        if base is object:
+            continue
+        for m_name, m in vars(base).items():
+            if m_name in seen or m_name.startswith('__'):
+                continue
+            seen.add(m_name)
+            if not isinstance(m, (staticmethod, classmethod)):
+                members.append((m_name, m))
+    return members
 
 
 def _extract_cases_from_module_or_class(module=None,                      # type: ModuleRef
@@ -427,62 +615,113 @@ def _extract_cases_from_module_or_class(module=None,                      # type
     if not ((cls is None) ^ (module is None)):
         raise ValueError("Only one of cls or module should be provided")
 
-    container = cls or module
-
-    # We will gather all cases in the reference module and put them in this dict (line no, case)
-    cases_dct = dict()
+    # We will gather all cases in the reference module and put them in this list of (line no, sub-index, case)
+    cases_lst = []
+    # the case functions and classes already seen, so that aliases (e.g. `case_b = case_a`) are collected only once
+    seen = set()
 
     # List members - only keep the functions from the module file (not the imported ones)
     if module is not None:
-        def _of_interest(f):
+        def _of_interest(f, _mod_name=module.__name__):
             # check if the function is actually *defined* in this module (not imported from elsewhere)
             # Note: we used code.co_filename == module.__file__ in the past
             # but on some targets the file changes to a cached one so this does not work reliably,
             # see https://github.com/smarie/python-pytest-cases/issues/72
-            try:
-                return f.__module__ == module.__name__
-            except:  # noqa
-                return False
+            f_mod_name = getattr(f, '__module__', None)
+            return f_mod_name is _mod_name or f_mod_name == _mod_name
     else:
         def _of_interest(x):  # noqa
             return True
 
-    for m_name, m in getmembers(container, _of_interest):
+    # Note: we do not use `inspect.getmembers` as it sorts all members and resolves all of them (dunder included),
+    # while we will sort the cases by line number anyway.
+    if cls is not None:
+        members = _class_members(cls)
+    else:
+        # a module's namespace is its __dict__: no need to go through `dir()` and `getattr`
+        members = vars(module).items()
+
+    for m_name, m in members:
+        if m_name.startswith('__') or not _of_interest(m):
+            continue
+
         if is_case_class(m):
+            if m in seen:
+                continue
+            seen.add(m)
             co_firstlineno = get_code_first_line(m)
             cls_cases = extract_cases_from_class(m, case_fun_prefix=case_fun_prefix, _case_param_factory=_case_param_factory)
             for _i, _m_item in enumerate(cls_cases):
-                gen_line_nb = co_firstlineno + (_i / len(cls_cases))
-                cases_dct[gen_line_nb] = _m_item
+                cases_lst.append((co_firstlineno, _i, _m_item))
 
         elif is_case_function(m, prefix=case_fun_prefix):
+            if m in seen:
+                continue
+            seen.add(m)
             co_firstlineno = get_code_first_line(m)
             if cls is not None:
-                if isinstance(cls.__dict__[m_name], (staticmethod, classmethod)):
-                    # skip it
-                    continue
-                # partialize the function to get one without the 'self' argument
-                new_m = partial(m, cls())
-                # remember the class
-                new_m.host_class = cls
-                # we have to recopy all metadata concerning the case function
-                new_m.__name__ = m.__name__
-                CaseInfo.copy_info(m, new_m)
-                copy_pytest_marks(m, new_m, override=True)
-                m = new_m
-                del new_m
+                # bind the function to an instance of the class to get one without the 'self' argument
+                m = _ClassBoundCase(m, cls)
 
             if _case_param_factory is None:
-                # Nominal usage: put the case in the dictionary
-                cases_dct[co_firstlineno] = m
+                # Nominal usage: put the case in the list
+                cases_lst.append((co_firstlineno, 0, m))
             else:
-                # Legacy usage where the cases generators were expanded here and inserted with a virtual line no
-                _case_param_factory(m, co_firstlineno, cases_dct)
+                # Legacy usage where the cases generators were expanded here and inserted with a sub-index
+                _case_param_factory(m, co_firstlineno, cases_lst)
+
+    # take all cases in order of appearance in the code (sort by source code line number, then sub-index)
+    cases_lst.sort(key=itemgetter(0, 1))
+    return [m for _, _, m in cases_lst]
+
+
+class _ClassBoundCase(object):
+    """
+    A case function defined in a case class, bound to an instance of this class. This is similar to a `partial` of the
+    function with the instance as first argument, with the relevant metadata of the function (name, case info and
+    pytest marks) and a reference to the host class. A single instance of each host class is used for all its cases.
+    """
+    __slots__ = ('func', 'host_class', 'host_instance', '__name__', CASE_FIELD, 'pytestmark')
+
+    def __init__(self, func, host_class):
+        self.func = func
+        self.host_class = host_class
+        self.host_instance = _get_case_class_instance(host_class)
+        # we have to recopy all metadata concerning the case function
+        self.__name__ = func.__name__
+        CaseInfo.copy_info(func, self)
+        copy_pytest_marks(func, self, override=True)
+
+    def __call__(self, *args, **kwargs):
+        return self.func(self.host_instance, *args, **kwargs)
+
+    def __repr__(self):
+        return "<case function %s.%s.%s>" % (self.host_class.__module__, self.host_class.__name__, self.__name__)
+
+    @property
+    def __signature__(self):
+        """The signature of the function without its first argument, used by `inspect.signature` """
+        sig = signature(self.func)
+        return sig.replace(parameters=tuple(sig.parameters.values())[1:])
+
+
+def _get_case_class_instance(cls  # type: Type
+                             ):
+    """
+    Returns the instance of case class `cls` used to bind its case functions, creating it if needed.
+
+    :param cls:
+    :return:
+    """
+    try:
+        return _case_classes_instances[cls]
+    except KeyError:
+        instance = _case_classes_instances[cls] = cls()
+        return instance
 
-    # convert into a list, taking all cases in order of appearance in the code (sort by source code line number)
-    cases = [cases_dct[k] for k in sorted(cases_dct.keys())]
 
-    return cases
+_case_classes_instances = dict()  # type: Dict[Type, Any]
+"""The instance of each case class used to bind its case functions"""
 
 
 # Below is the beginning of a switch from our code scanning tool above to the same one than pytest.
@@ -1,12 +1,15 @@
 from __future__ import division
 
+import sys
+from collections import OrderedDict
+
 try:  # python 3.3+
     from inspect import signature, Parameter
 except ImportError:
     from funcsigs import signature, Parameter  # noqa
 
-from distutils.version import LooseVersion
 from inspect import isgeneratorfunction, isclass
+from itertools import chain, product
 
 try:
     from typing import Union, Callable, Any, Optional, Tuple, Type  # noqa
@@ -18,12 +21,12 @@ from _pytest.python import Metafunc
 
 from .common_mini_six import string_types
 from .common_pytest_marks import make_marked_parameter_value, get_param_argnames_as_list, has_pytest_param, \
-    get_pytest_parametrize_marks
+    get_pytest_parametrize_marks, PYTEST3_OR_GREATER, PYTEST34_OR_GREATER
 from .common_pytest_lazy_values import is_lazy_value
 
 
 # A decorator that will work to create a fixture containing 'yield', whatever the pytest version, and supports hooks
-if LooseVersion(pytest.__version__) >= LooseVersion('3.0.0'):
+if PYTEST3_OR_GREATER:
     def pytest_fixture(hook=None, **kwargs):
         def _decorate(f):
             # call hook if needed
@@ -53,11 +56,13 @@ else:
         return _decorate
 
 
+# dicts preserve insertion order starting from python 3.7
+_ordered_fromkeys = dict.fromkeys if sys.version_info >= (3, 7) else OrderedDict.fromkeys
+
+
 def remove_duplicates(lst):
-    dset = set()
-    # relies on the fact that dset.add() always returns None.
-    return [item for item in lst
-            if item not in dset and not dset.add(item)]
+    """Returns a list containing the (hashable) items of `lst` without duplicates, in their original order"""
+    return list(_ordered_fromkeys(lst))
 
 
 def is_fixture(fixture_fun  # type: Any
@@ -68,12 +73,7 @@ def is_fixture(fixture_fun  # type: Any
     :param fixture_fun:
     :return:
     """
-    try:
-        fixture_fun._pytestfixturefunction  # noqa
-        return True
-    except AttributeError:
-        # not a fixture ?
-        return False
+    return getattr(fixture_fun, '_pytestfixturefunction', None) is not None
 
 
 def safe_isclass(obj  # type: object
@@ -112,14 +112,15 @@ def get_fixture_name(fixture_fun  # type: Union[str, Callable]
     """
     if isinstance(fixture_fun, string_types):
         return fixture_fun
-    assert_is_fixture(fixture_fun)
+
+    fixture_marker = getattr(fixture_fun, '_pytestfixturefunction', None)
+    if fixture_marker is None:
+        assert_is_fixture(fixture_fun)  # this raises the appropriate error
+
     try:  # pytest 3
-        custom_fixture_name = fixture_fun._pytestfixturefunction.name  # noqa
-    except AttributeError:
-        try:  # pytest 2
-            custom_fixture_name = fixture_fun.func_name  # noqa
-        except AttributeError:
-            custom_fixture_name = None
+        custom_fixture_name = fixture_marker.name
+    except AttributeError:  # pytest 2
+        custom_fixture_name = getattr(fixture_fun, 'func_name', None)
 
     if custom_fixture_name is not None:
         # there is a custom fixture name
@@ -142,8 +143,10 @@ def get_fixture_scope(fixture_fun):
     :param fixture_fun:
     :return:
     """
-    assert_is_fixture(fixture_fun)
-    return fixture_fun._pytestfixturefunction.scope  # noqa
+    fixture_marker = getattr(fixture_fun, '_pytestfixturefunction', None)
+    if fixture_marker is None:
+        assert_is_fixture(fixture_fun)  # this raises the appropriate error
+    return fixture_marker.scope
     # except AttributeError:
     #     # pytest 2
     #     return fixture_fun.func_scope
@@ -159,15 +162,12 @@ def is_function_node(node):
         return False
 
 
-def get_parametrization_markers(fnode):
-    """
-    Returns the parametrization marks on a pytest Function node.
-    :param fnode:
-    :return:
-    """
-    if LooseVersion(pytest.__version__) >= LooseVersion('3.4.0'):
+# Returns the parametrization marks on a pytest Function node, whatever the pytest version
+if PYTEST34_OR_GREATER:
+    def get_parametrization_markers(fnode):
         return list(fnode.iter_markers(name="parametrize"))
-    else:
+else:
+    def get_parametrization_markers(fnode):
         return list(fnode.parametrize)
 
 
@@ -180,9 +180,14 @@ def get_param_names(fnode):
     :return:
     """
     p_markers = get_parametrization_markers(fnode)
+    if len(p_markers) == 1:
+        # common case: a single parametrization mark. Note: get_param_argnames_as_list always returns a new list
+        return get_param_argnames_as_list(p_markers[0].args[0])
+
     param_names = []
+    _extend = param_names.extend
     for paramz_mark in p_markers:
-        param_names += get_param_argnames_as_list(paramz_mark.args[0])
+        _extend(get_param_argnames_as_list(paramz_mark.args[0]))
     return param_names
 
 
@@ -195,8 +200,7 @@ def combine_ids(paramid_tuples):
     :param paramid_tuples:
     :return:
     """
-    #
-    return ['-'.join(pid for pid in testid) for testid in paramid_tuples]
+    return ['-'.join(testid) for testid in paramid_tuples]
 
 
 def make_test_ids(global_ids, id_marks, argnames=None, argvalues=None, precomputed_ids=None):
@@ -255,20 +259,22 @@ def make_test_ids_from_param_values(param_names,
     nb_params = len(param_names)
     if nb_params == 0:
         raise ValueError("empty list provided")
-    elif nb_params == 1:
-        paramids = []
-        for _idx, v in enumerate(param_values):
-            _id = mini_idvalset(param_names, (v,), _idx)
-            paramids.append(_id)
+
+    # bind to locals: this is called for every parametrization
+    _idval_local = _call_idval
+    if nb_params == 1:
+        # no need to build a (v,) tuple and to join a single id
+        argname0 = param_names[0]
+        return [_idval_local(v, argname0, _idx) for _idx, v in enumerate(param_values)]
     else:
         paramids = []
+        _append = paramids.append
         for _idx, vv in enumerate(param_values):
             if len(vv) != nb_params:
                 raise ValueError("Inconsistent lenghts for parameter names and values: '%s' and '%s'"
                                  "" % (param_names, vv))
-            _id = mini_idvalset(param_names, vv, _idx)
-            paramids.append(_id)
-    return paramids
+            _append("-".join([_idval_local(val, argname, _idx) for val, argname in zip(vv, param_names)]))
+        return paramids
 
 
 # ---- ParameterSet api ---
@@ -320,14 +326,26 @@ def extract_parameterset_info(argnames, argvalues, check_nb=True):
     if isinstance(argnames, string_types):
         raise TypeError("argnames must be an iterable. Found %r" % argnames)
     nbnames = len(argnames)
-    for v in argvalues:
-        _pid, _pmark, _pvalue = extract_pset_info_single(nbnames, v)
+    check = check_nb and nbnames > 1
 
-        pids.append(_pid)
-        pmarks.append(_pmark)
-        pvalues.append(_pvalue)
+    # bind to locals, this loop runs once per parameter value
+    pids_append, pmarks_append, pvalues_append = pids.append, pmarks.append, pvalues.append
+    is_marked = is_marked_parameter_value
+    for v in argvalues:
+        # inlined version of extract_pset_info_single
+        if is_marked(v):
+            _pvalue = get_marked_parameter_values(v)
+            if nbnames == 1:
+                _pvalue = _pvalue[0]
+            pids_append(get_marked_parameter_id(v))
+            pmarks_append(get_marked_parameter_marks(v))
+        else:
+            _pvalue = v
+            pids_append(None)
+            pmarks_append(None)
+        pvalues_append(_pvalue)
 
-        if check_nb and nbnames > 1 and (len(_pvalue) != nbnames):
+        if check and (len(_pvalue) != nbnames):
             raise ValueError("Inconsistent number of values in pytest parametrize: %s items found while the "
                              "number of parameters is %s: %s." % (len(_pvalue), nbnames, _pvalue))
 
@@ -353,7 +371,8 @@ try:  # pytest 3.x+
     from _pytest.mark import ParameterSet  # noqa
 
     def is_marked_parameter_value(v):
-        return isinstance(v, ParameterSet)
+        # exact type check first: it is the most common case for marked values
+        return type(v) is ParameterSet or isinstance(v, ParameterSet)
 
     def get_marked_parameter_marks(v):
         return v.marks
@@ -388,7 +407,8 @@ except ImportError:  # pytest 2.x
             return marks[0](val)
 
     def is_marked_parameter_value(v):
-        return isinstance(v, MarkDecorator)
+        # exact type check first: it is the most common case for marked values
+        return type(v) is MarkDecorator or isinstance(v, MarkDecorator)
 
     def get_marked_parameter_marks(v):
         return [v]
@@ -417,27 +437,36 @@ except ImportError:
     from _pytest.python import scopes as pt_scopes, Metafunc  # noqa
 
 
+_SCOPE_INDEX = {s: i for i, s in enumerate(pt_scopes)}
+"""The index of each pytest scope in `pt_scopes`, precomputed once"""
+
+_FUNCTION_SCOPENUM = _SCOPE_INDEX["function"]
+
+
 def get_pytest_scopenum(scope_str):
-    return pt_scopes.index(scope_str)
+    try:
+        return _SCOPE_INDEX[scope_str]
+    except KeyError:
+        raise ValueError("%r is not a valid pytest scope. Valid scopes are %r" % (scope_str, pt_scopes))
 
 
 def get_pytest_function_scopenum():
-    return pt_scopes.index("function")
+    return _FUNCTION_SCOPENUM
 
 
 from _pytest.python import _idval  # noqa
 
 
-if LooseVersion(pytest.__version__) >= LooseVersion('3.0.0'):
-    _idval_kwargs = dict(idfn=None,
-                         item=None,  # item is only used by idfn
-                         config=None  # if a config hook was available it would be used before this is called)
-                         )
+# specialized `_idval` callers with the constant arguments baked in, to avoid a `**kwargs` expansion on each call
+if PYTEST3_OR_GREATER:
+    def _call_idval(val, argname, idx):
+        return _idval(val=val, argname=argname, idx=idx, idfn=None,
+                      item=None,  # item is only used by idfn
+                      config=None  # if a config hook was available it would be used before this is called
+                      )
 else:
-    _idval_kwargs = dict(idfn=None,
-                         # item=None,  # item is only used by idfn
-                         # config=None  # if a config hook was available it would be used before this is called)
-                         )
+    def _call_idval(val, argname, idx):
+        return _idval(val=val, argname=argname, idx=idx, idfn=None)
 
 
 def mini_idval(
@@ -453,23 +482,19 @@ def mini_idval(
     :param idx:
     :return:
     """
-    return _idval(val=val, argname=argname, idx=idx, **_idval_kwargs)
+    return _call_idval(val, argname, idx)
 
 
 def mini_idvalset(argnames, argvalues, idx):
     """ mimic _pytest.python._idvalset """
-    this_id = [
-        _idval(val, argname, idx=idx, **_idval_kwargs)
-        for val, argname in zip(argvalues, argnames)
-    ]
-    return "-".join(this_id)
+    # note: str.join is faster with a list than with a generator, as it knows the length upfront
+    _idval_local = _call_idval
+    return "-".join([_idval_local(val, argname, idx) for val, argname in zip(argvalues, argnames)])
 
 
 try:
     from _pytest.compat import getfuncargnames  # noqa
 except ImportError:
-    import sys
-
     def num_mock_patch_args(function):
         """ return number of arguments used up by mock arguments (if any) """
         patchings = getattr(function, "patchings", None)
@@ -483,9 +508,19 @@ except ImportError:
             [p for p in patchings if not p.attribute_name and (p.new is mock_sentinel or p.new is ut_mock_sentinel)]
         )
 
+    _funcargnames_cache = dict()
+    """A cache of the results of `getfuncargnames`, by (function, cls)"""
+
     # noinspection SpellCheckingInspection
     def getfuncargnames(function, cls=None):
         """Returns the names of a function's mandatory arguments."""
+        try:
+            return _funcargnames_cache[(function, cls)]
+        except KeyError:
+            arg_names = _funcargnames_cache[(function, cls)] = _getfuncargnames(function, cls)
+            return arg_names
+
+    def _getfuncargnames(function, cls=None):
         parameters = signature(function).parameters
 
         arg_names = tuple(
@@ -529,7 +564,7 @@ class MiniMetafunc(Metafunc):
         self.pmarks = get_pytest_parametrize_marks(self.function)
         if self.is_parametrized:
             self.update_callspecs()
-            self.required_fixtures = set(self.fixturenames) - set(self._calls[0].funcargs)
+            self.required_fixtures = frozenset(self.fixturenames).difference(self._calls[0].funcargs)
         else:
             self.required_fixtures = self.fixturenames
 
@@ -541,22 +576,40 @@ class MiniMetafunc(Metafunc):
     def requires_fixtures(self):
         return len(self.required_fixtures) > 0
 
-    def update_callspecs(self):
+    def _parametrize_from_marks(self):
         """
+        Parametrizes this metafunc with all the parametrization marks found on the function.
 
         :return:
         """
         for pmark in self.pmarks:
             if len(pmark.param_names) == 1:
-                argvals = tuple(v if is_marked_parameter_value(v) else (v,) for v in pmark.param_values)
+                vals = pmark.param_values
+                if not isinstance(vals, (list, tuple)):
+                    vals = tuple(vals)  # we may iterate twice
+                if any(is_marked_parameter_value(v) for v in vals):
+                    argvals = tuple(v if is_marked_parameter_value(v) else (v,) for v in vals)
+                else:
+                    # common case: no marked value, wrap all values in single-element tuples at once
+                    argvals = tuple(zip(vals))
             else:
                 argvals = pmark.param_values
             self.parametrize(argnames=pmark.param_names, argvalues=argvals, ids=pmark.param_ids,
                              # use indirect = False and scope = 'function' to avoid having to implement complex patches
                              indirect=False, scope='function')
 
-        if not has_pytest_param:
-            # fix the CallSpec2 instances so that the marks appear
+    # the version-dependent part of `update_callspecs` is decided once, here
+    if has_pytest_param:
+        update_callspecs = _parametrize_from_marks
+    else:
+        def update_callspecs(self):
+            """
+            Same as `_parametrize_from_marks`, but also fixes the CallSpec2 instances so that the marks appear.
+
+            :return:
+            """
+            self._parametrize_from_marks()
+
             # noinspection PyProtectedMember
             for c in self._calls:
                 c.marks = list(c.keywords.values())
@@ -578,7 +631,8 @@ def get_callspecs(func):
 
 def cart_product_pytest(argnames, argvalues):
     """
-     - do NOT use `itertools.product` as it fails to handle MarkDecorators
+     - do NOT use `itertools.product` directly on the argvalues as it fails to handle MarkDecorators: each dimension
+       is first pre-processed into a list of (marks, values) so that the product is only done on plain tuples
      - we also unpack tuples associated with several argnames ("a,b") if needed
      - we also propagate marks
 
@@ -586,39 +640,57 @@ def cart_product_pytest(argnames, argvalues):
     :param argvalues:
     :return:
     """
+    nb_dims = len(argvalues)
+    if nb_dims == 0:
+        return [], []
+
     # transform argnames into a list of lists
     argnames_lists = [get_param_argnames_as_list(_argnames) if len(_argnames) > 0 else [] for _argnames in argnames]
 
-    # make the cartesian product per se
-    argvalues_prod = _cart_product_pytest(argnames_lists, argvalues)
+    # extract the marks and (possibly unpacked) values of each dimension once
+    dims = [_cart_product_dim(len(_argnames_list), _argvalues)
+            for _argnames_list, _argvalues in zip(argnames_lists, argvalues)]
+
+    if nb_dims == 1:
+        # single dimension: no product to make
+        argvalues_prod = [make_marked_parameter_value(tuple(values), marks=list(marks)) if len(marks) > 0
+                          else tuple(values) for marks, values in dims[0]]
+        return argnames_lists[0], argvalues_prod
 
     # flatten the list of argnames
     argnames_list = [n for nlist in argnames_lists for n in nlist]
 
-    # apply all marks to the arvalues
-    argvalues_prod = [make_marked_parameter_value(tuple(argvalues), marks=marks) if len(marks) > 0 else tuple(argvalues)
-                      for marks, argvalues in argvalues_prod]
+    # make the cartesian product per se and apply all marks to the argvalues
+    _flatten = chain.from_iterable
+    argvalues_prod = []
+    for combination in product(*dims):
+        marks = list(_flatten(c[0] for c in combination))
+        values = tuple(_flatten(c[1] for c in combination))
+        argvalues_prod.append(make_marked_parameter_value(values, marks=marks) if len(marks) > 0 else values)
 
     return argnames_list, argvalues_prod
 
 
-def _cart_product_pytest(argnames_lists, argvalues):
-    result = []
-
-    # first perform the sub cartesian product with entries [1:]
-    sub_product = _cart_product_pytest(argnames_lists[1:], argvalues[1:]) if len(argvalues) > 1 else None
-
-    # then do the final product with entry [0]
-    for x in argvalues[0]:
-        # handle x
-        nb_names = len(argnames_lists[0])
+def _cart_product_dim(nb_names, argvalues):
+    """
+    Pre-processes a single dimension of `cart_product_pytest`.
 
-        # (1) extract meta-info
-        x_id, x_marks, x_value = extract_pset_info_single(nb_names, x)
-        x_marks_lst = list(x_marks) if x_marks is not None else []
-        if x_id is not None:
-            raise ValueError("It is not possible to specify a sub-param id when using the new parametrization style. "
-                             "Either use the traditional style or customize all ids at once in `idgen`")
+    :param nb_names: the number of argnames in this dimension
+    :param argvalues: the argvalues for this dimension
+    :return: a list of (marks, values) tuples, one for each argvalue
+    """
+    dim = []
+    _append = dim.append
+    is_marked = is_marked_parameter_value
+    for x in argvalues:
+        # (1) extract meta-info (inlined version of extract_pset_info_single: most values are not marked)
+        if is_marked(x):
+            x_id, x_marks, x_value = extract_pset_info_single(nb_names, x)
+            if x_id is not None:
+                raise ValueError("It is not possible to specify a sub-param id when using the new parametrization "
+                                 "style. Either use the traditional style or customize all ids at once in `idgen`")
+        else:
+            x_marks, x_value = None, x
 
         # (2) possibly unpack
         if nb_names > 1:
@@ -626,16 +698,10 @@ def _cart_product_pytest(argnames_lists, argvalues):
             if is_lazy_value(x_value):
                 x_value_lst = x_value.as_lazy_items_list(nb_names)
             else:
-                x_value_lst = list(x_value)
+                x_value_lst = tuple(x_value)
         else:
-            x_value_lst = [x_value]
+            x_value_lst = (x_value,)
 
-        # product
-        if len(argvalues) > 1:
-            for m, p in sub_product:
-                # combine marks and values
-                result.append((x_marks_lst + m, x_value_lst + p))
-        else:
-            result.append((x_marks_lst, x_value_lst))
+        _append((x_marks if x_marks is not None else (), x_value_lst))
 
-    return result
+    return dim
@@ -1,4 +1,3 @@
-from distutils.version import LooseVersion
 from functools import partial
 
 try:  # python 3.3+
@@ -11,13 +10,11 @@ try:
 except ImportError:
     pass
 
-import pytest
+from .common_pytest_marks import get_pytest_marks_on_function, transform_marks_into_decorators, \
+    PYTEST53_OR_GREATER
 
-from .common_pytest_marks import get_pytest_marks_on_function, transform_marks_into_decorators
 
-
-pytest53 = LooseVersion(pytest.__version__) >= LooseVersion("5.3.0")
-if pytest53:
+if PYTEST53_OR_GREATER:
     # in the latest versions of pytest, the default _idmaker returns the value of __name__ if it is available,
     # even if an object is not a class nor a function. So we do not need to use any special trick.
     _LazyValueBase = object
@@ -122,7 +119,7 @@ class LazyValue(Lazy, _LazyValueBase):
     A `lazy_value` is the same thing than a function-scoped fixture, except that the value getter function is not a
     fixture and therefore can neither be parametrized nor depend on fixtures. It should have no mandatory argument.
     """
-    if pytest53:
+    if PYTEST53_OR_GREATER:
         __slots__ = 'valuegetter', '_id', '_marks'
     else:
         # we can not define __slots__ since we extend int,
@@ -189,7 +186,7 @@ class LazyTupleItem(Lazy, _LazyValueBase):
     """
     An item in a Lazy Tuple
     """
-    if pytest53:
+    if PYTEST53_OR_GREATER:
         __slots__ = 'host', 'item'
     else:
         # we can not define __slots__ since we extend int,
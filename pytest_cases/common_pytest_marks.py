@@ -1,5 +1,5 @@
+import re
 import warnings
-from distutils.version import LooseVersion
 
 try:  # python 3.3+
     from inspect import signature
@@ -12,6 +12,23 @@ import pytest
 from .common_mini_six import string_types
 
 
+# pytest versions, computed once at import time
+_m = re.match(r'(\d+)\.(\d+)', pytest.__version__)
+_PYTEST_VER = (int(_m.group(1)), int(_m.group(2)))
+del _m
+
+PYTEST3_OR_GREATER = _PYTEST_VER >= (3, 0)
+PYTEST34_OR_GREATER = _PYTEST_VER >= (3, 4)
+PYTEST35_OR_GREATER = _PYTEST_VER >= (3, 5)
+PYTEST37_OR_GREATER = _PYTEST_VER >= (3, 7)
+PYTEST46_OR_GREATER = _PYTEST_VER >= (4, 6)
+PYTEST53_OR_GREATER = _PYTEST_VER >= (5, 3)
+
+
+_argnames_cache = dict()
+"""A cache of the parsed coma-separated argnames strings, see `get_param_argnames_as_list`"""
+
+
 def get_param_argnames_as_list(argnames):
     """
     pytest parametrize accepts both coma-separated names and list/tuples.
@@ -20,7 +37,11 @@ def get_param_argnames_as_list(argnames):
     :return:
     """
     if isinstance(argnames, string_types):
-        argnames = argnames.replace(' ', '').split(',')
+        try:
+            argnames = _argnames_cache[argnames]
+        except KeyError:
+            argnames = _argnames_cache[argnames] = tuple(argnames.replace(' ', '').split(','))
+    # always return a new list since callers may modify it
     return list(argnames)
 
 
@@ -195,7 +216,7 @@ def transform_marks_into_decorators(marks, function_marks=False):
             for m in marks:
                 md = pytest.mark.MarkDecorator()
 
-                if LooseVersion(pytest.__version__) >= LooseVersion('3.0.0'):
+                if PYTEST3_OR_GREATER:
                     if isinstance(m, type(md)):
                         # already a decorator, we can use it
                         marks_mod.append(m)
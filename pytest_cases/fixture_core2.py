@@ -1,6 +1,5 @@
 from __future__ import division
 
-from distutils.version import LooseVersion
 from inspect import isgeneratorfunction
 from itertools import product
 from warnings import warn
@@ -22,6 +21,7 @@ except ImportError:
     pass
 
 from .common_pytest_lazy_values import get_lazy_args
+from .common_pytest_marks import PYTEST3_OR_GREATER
 from .common_pytest import get_pytest_parametrize_marks, make_marked_parameter_value, get_param_argnames_as_list, \
     analyze_parameter_set, combine_ids, is_marked_parameter_value, get_marked_parameter_values, pytest_fixture
 from .fixture__creation import get_caller_module, check_name_available, WARN, CHANGE
@@ -344,7 +344,7 @@ def _decorate_fixture_plus(fixture_func,
     """
     if name is not None:
         # Compatibility for the 'name' argument
-        if LooseVersion(pytest.__version__) >= LooseVersion('3.0.0'):
+        if PYTEST3_OR_GREATER:
             # pytest version supports "name" keyword argument
             kwargs['name'] = name
         elif name is not None:
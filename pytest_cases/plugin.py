@@ -1,6 +1,5 @@
 from collections import OrderedDict, namedtuple
 from copy import copy
-from distutils.version import LooseVersion
 from functools import partial
 from warnings import warn
 
@@ -18,6 +17,7 @@ except ImportError:
     pass
 
 from .common_mini_six import string_types
+from .common_pytest_marks import PYTEST35_OR_GREATER, PYTEST37_OR_GREATER, PYTEST46_OR_GREATER
 from .common_pytest_lazy_values import get_lazy_args
 from .common_pytest import get_pytest_nodeid, get_pytest_function_scopenum, is_function_node, get_param_names, \
     get_pytest_scopenum, get_param_argnames_as_list
@@ -233,7 +233,7 @@ class FixtureClosureNode(object):
             # crawl the tree to get the list of unique fixture names
             fixturenames_closure = self._to_list()
 
-            if LooseVersion(pytest.__version__) >= LooseVersion('3.5.0'):
+            if PYTEST35_OR_GREATER:
                 # sort by scope
                 def sort_by_scope(arg_name):
                     try:
@@ -594,11 +594,11 @@ def getfixtureclosure(fm, fixturenames, parentnode, ignore_args=()):
 
     # first retrieve the normal pytest output for comparison
     kwargs = dict()
-    if LooseVersion(pytest.__version__) >= LooseVersion('4.6.0'):
+    if PYTEST46_OR_GREATER:
         # new argument "ignore_args" in 4.6+
         kwargs['ignore_args'] = ignore_args
 
-    if LooseVersion(pytest.__version__) >= LooseVersion('3.7.0'):
+    if PYTEST37_OR_GREATER:
         # three outputs
         initial_names, ref_fixturenames, ref_arg2fixturedefs = \
             fm.__class__.getfixtureclosure(fm, fixturenames, parentnode, **kwargs)
@@ -664,7 +664,7 @@ def getfixtureclosure(fm, fixturenames, parentnode, ignore_args=()):
     # note as an alternative we could return a custom object in place of the ref_fixturenames
     # store_union_closure_in_node(fixturenames_closure_node, parentnode)
 
-    if LooseVersion(pytest.__version__) >= LooseVersion('3.7.0'):
+    if PYTEST37_OR_GREATER:
         return _init_fixnames, fixturenames_closure_node, arg2fixturedefs
     else:
         return fixturenames_closure_node, arg2fixturedefs
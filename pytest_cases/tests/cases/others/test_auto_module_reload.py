@@ -0,0 +1,50 @@
+import sys
+
+from pytest_cases import get_all_cases, AUTO
+
+
+def _write_cases_module(tmpdir, dir_name, case_name):
+    d = tmpdir.mkdir(dir_name)
+    d.join("pc_reload_test_foo_cases.py").write("def %s():\n    return 1\n" % case_name)
+    return str(d)
+
+
+def _invalidate_import_caches():
+    try:
+        from importlib import invalidate_caches
+    except ImportError:  # python 2
+        pass
+    else:
+        invalidate_caches()
+
+
+def test_auto_cases_module_is_not_cached(tmpdir, monkeypatch):
+    """The AUTO cases module should be resolved again when `sys.modules` and `sys.path` change"""
+
+    def f():
+        pass
+    f.__module__ = "pc_reload_test_foo"
+
+    mod_name = "pc_reload_test_foo_cases"
+    monkeypatch.delitem(sys.modules, mod_name, raising=False)
+
+    # no cases module yet: error
+    try:
+        get_all_cases(f, cases=AUTO)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a ValueError should have been raised")
+
+    # a cases module is created afterwards: it should be found
+    monkeypatch.syspath_prepend(_write_cases_module(tmpdir, "a", "case_a"))
+    _invalidate_import_caches()
+    assert [c.__name__ for c in get_all_cases(f, cases=AUTO)] == ['case_a']
+
+    # the module is removed from sys.modules and another directory is used: the new module should be used
+    del sys.modules[mod_name]
+    monkeypatch.syspath_prepend(_write_cases_module(tmpdir, "b", "case_b"))
+    _invalidate_import_caches()
+    assert [c.__name__ for c in get_all_cases(f, cases=AUTO)] == ['case_b']
+
+    del sys.modules[mod_name]
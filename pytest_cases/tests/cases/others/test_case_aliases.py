@@ -0,0 +1,35 @@
+from pytest_cases import parametrize_with_cases, get_all_cases
+
+
+def case_a():
+    return 1
+
+
+case_b = case_a
+
+
+class CasesFoo:
+    def case_m(self):
+        return 2
+
+    case_n = case_m
+
+
+CasesBar = CasesFoo
+
+
+@parametrize_with_cases("x", cases='.')
+def test_aliases(x):
+    assert x in (1, 2)
+
+
+def test_aliases_collected_once():
+    assert [c.__name__ for c in get_all_cases(test_aliases, cases='.')] == ['case_a', 'case_m']
+
+
+def test_synthesis(module_results_dct):
+    assert list(module_results_dct) == [
+        'test_aliases[a]',
+        'test_aliases[m]',
+        'test_aliases_collected_once',
+    ]
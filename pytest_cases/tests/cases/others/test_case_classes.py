@@ -0,0 +1,41 @@
+from pytest_cases import parametrize_with_cases, get_all_cases
+
+
+class CasesBase:
+    def case_base(self):
+        return 1
+
+    def case_overridden(self):
+        return -1
+
+    @staticmethod
+    def case_static():
+        return -2
+
+
+class CasesChild(CasesBase):
+    def case_overridden(self):
+        return 2
+
+    @classmethod
+    def case_cls(cls):
+        return -3
+
+
+@parametrize_with_cases("a", cases=CasesChild)
+def test_inherited_cases(a):
+    assert a > 0
+
+
+def test_repr():
+    cases = get_all_cases(test_inherited_cases, cases=CasesChild)
+    assert [repr(c) for c in cases] == ["<case function %s.CasesChild.case_base>" % __name__,
+                                        "<case function %s.CasesChild.case_overridden>" % __name__]
+
+
+def test_synthesis(module_results_dct):
+    assert sorted(module_results_dct) == [
+        'test_inherited_cases[base]',
+        'test_inherited_cases[overridden]',
+        'test_repr',
+    ]
@@ -0,0 +1,43 @@
+from pytest_cases import parametrize_with_cases, case
+
+
+def case_int_success():
+    return 1
+
+
+def case_int_success_but_not_really():
+    return -1
+
+
+@case(id="a.b")
+def case_with_dot():
+    return 2
+
+
+@case(id="axb")
+def case_with_x():
+    return 3
+
+
+@parametrize_with_cases("data", cases='.', glob="*success")
+def test_glob_is_anchored(data):
+    assert data == 1
+
+
+@parametrize_with_cases("data", cases='.', glob="a.b")
+def test_glob_is_escaped(data):
+    assert data == 2
+
+
+@parametrize_with_cases("data", cases='.', glob="a?b")
+def test_glob_single_char(data):
+    assert data in (2, 3)
+
+
+def test_synthesis(module_results_dct):
+    assert list(module_results_dct) == [
+        'test_glob_is_anchored[int_success]',
+        'test_glob_is_escaped[a.b]',
+        'test_glob_single_char[a.b]',
+        'test_glob_single_char[axb]'
+    ]
@@ -0,0 +1,27 @@
+from pytest_cases import parametrize_with_cases
+
+
+def case_a():
+    return 'a'
+
+
+@parametrize_with_cases("data", cases='.')
+def test_first(data):
+    assert data == 'a'
+
+
+def case_b():
+    return 'b'
+
+
+@parametrize_with_cases("data", cases='.')
+def test_second(data):
+    assert data in ('a', 'b')
+
+
+def test_synthesis(module_results_dct):
+    assert list(module_results_dct) == [
+        'test_first[a]',
+        'test_second[a]',
+        'test_second[b]',
+    ]
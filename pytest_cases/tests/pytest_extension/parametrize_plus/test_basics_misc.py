@@ -15,6 +15,17 @@ from ...utils import skip
 
 def test_cart_product_pytest():
 
+    # empty
+    names_lst, values = cart_product_pytest((), ())
+    assert names_lst == []
+    assert values == []
+
+    # single dimension
+    names_lst, values = cart_product_pytest(('a,b',), ([(True, 1), skip(False, 2)],))
+    assert names_lst == ['a', 'b']
+    assert values[0] == (True, 1)
+    assert get_marked_parameter_values(values[1]) == (False, 2)
+
     # simple
     names_lst, values = cart_product_pytest(('a', 'b'), ([True], [1, 2]))
     assert names_lst == ['a', 'b']